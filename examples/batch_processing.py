@@ -4,70 +4,237 @@ German-OCR Batch Processing Example
 
 Demonstrates processing multiple documents efficiently.
 
+All documents are first submitted to the API without waiting for their
+results. The job ids are stored in a SQLite database (jobs.db), then all
+jobs are polled concurrently and each result is written to ./results as
+soon as it is ready. If the run is interrupted, start it again with
+--resume: finished documents are skipped and submitted jobs are polled
+again instead of being paid for twice.
+
+The number of requests in flight (submissions and status polls) is
+bounded by GERMAN_OCR_CONCURRENCY (default: 8), and new requests are
+started at most GERMAN_OCR_MAX_RPS times per second (default: 5).
+Requests rejected with a rate-limit or quota error are retried with
+exponential backoff. Only documents the API reports as failed are marked
+as errors; jobs whose status could not be fetched (connection problems,
+timeouts, rate limits) stay pending and are polled again with --resume.
+
+Usage:
+    python batch_processing.py            # process ./invoices
+    python batch_processing.py --resume   # continue an interrupted run
+
 Get your API credentials at: https://app.german-ocr.de
 """
 
+import argparse
+import asyncio
 import os
+import random
+import sqlite3
+import time
 from pathlib import Path
-from german_ocr import CloudClient, CloudError
+from german_ocr import CloudClient, CloudError, ProcessingError, RateLimitError
 
 API_KEY = os.environ.get("GERMAN_OCR_API_KEY", "your_api_key")
 API_SECRET = os.environ.get("GERMAN_OCR_API_SECRET", "your_api_secret")
+CONCURRENCY = int(os.environ.get("GERMAN_OCR_CONCURRENCY", 8))
+MAX_RPS = float(os.environ.get("GERMAN_OCR_MAX_RPS", 5))
+POLL_INTERVAL = 2.0
+MAX_WAIT = 300.0
+
+DOCUMENTS_DIR = Path("./invoices")
+RESULTS_DIR = Path("./results")
+JOBS_DB = Path("./jobs.db")
+
 
+class RateLimiter:
+    """Token bucket that caps how many requests are started per second."""
 
-def main():
-    client = CloudClient(
-        api_key=API_KEY,
-        api_secret=API_SECRET,
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def open_jobs_db(path: Path, resume: bool) -> sqlite3.Connection:
+    """Open the job database; a fresh run starts with an empty table."""
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS jobs ("
+        " path TEXT PRIMARY KEY,"
+        " job_id TEXT,"
+        " status TEXT NOT NULL,"
+        " result_path TEXT,"
+        " error TEXT)"
     )
+    if not resume:
+        db.execute("DELETE FROM jobs")
+    db.commit()
+    return db
 
-    # Process all PDFs in a directory
-    documents_dir = Path("./invoices")
 
-    if not documents_dir.exists():
-        print(f"Directory {documents_dir} not found. Creating sample...")
-        documents_dir.mkdir(exist_ok=True)
-        print(f"Please add PDF files to {documents_dir.absolute()}")
-        return
+def update_job(db: sqlite3.Connection, path: str, **fields):
+    """Update columns of a job row and persist immediately."""
+    columns = ", ".join(f"{name} = ?" for name in fields)
+    db.execute(f"UPDATE jobs SET {columns} WHERE path = ?", (*fields.values(), path))
+    db.commit()
 
-    pdf_files = list(documents_dir.glob("*.pdf"))
-    print(f"Found {len(pdf_files)} PDF files\n")
 
-    results = []
-    for pdf_file in pdf_files:
-        print(f"Processing: {pdf_file.name}")
+def _is_rate_limited(error: CloudError) -> bool:
+    """Check whether an error is a transient rate-limit / quota rejection."""
+    if isinstance(error, RateLimitError):
+        return True
+    message = str(error).lower()
+    return "rate" in message or "quota" in message
+
+
+async def _with_retry(func, *args, max_attempts=3, base=1.0, cap=16.0, **kwargs):
+    """Call an async client method, retrying rate-limit errors with exponential backoff."""
+    for attempt in range(max_attempts):
+        try:
+            return await func(*args, **kwargs)
+        except CloudError as e:
+            if not _is_rate_limited(e) or attempt == max_attempts - 1:
+                raise
+            delay = min(cap, base * 2 ** attempt) + random.uniform(0, 0.25)
+            print(f"  Rate limited ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+async def submit_all(client, db, paths, sem, limiter):
+    """Submit documents without waiting for results and record their job ids."""
+
+    async def submit(path):
+        async with sem:
+            await limiter.acquire()
+            try:
+                job = await _with_retry(
+                    client.submit_async,
+                    path,
+                    model="cloud_fast",  # German-OCR Pro: fast and reliable
+                    output_format="json",
+                )
+            except CloudError as e:
+                update_job(db, path, status="failed", error=str(e))
+                print(f"  {Path(path).name} ERROR: {e}")
+                return
+            update_job(db, path, job_id=job.job_id, status="submitted")
+            print(f"Submitted: {Path(path).name} -> {job.job_id}")
+
+    await asyncio.gather(*[submit(p) for p in paths])
+
+
+async def collect_all(client, db, jobs, sem, limiter):
+    """Poll submitted jobs concurrently and store each result as it completes."""
+    RESULTS_DIR.mkdir(exist_ok=True)
+
+    async def fetch(func, job_id):
+        # Every poll shares the concurrency and rate limits with submissions
+        async with sem:
+            await limiter.acquire()
+            return await _with_retry(func, job_id)
+
+    async def wait(path, job_id):
+        deadline = time.monotonic() + MAX_WAIT
         try:
-            result = client.analyze(
-                str(pdf_file),
-                model="german-ocr-pro",  # Fast and reliable
-                output_format="json",
-            )
-            results.append({
-                "file": pdf_file.name,
-                "status": "success",
-                "text_length": len(result.text),
-                "processing_ms": result.processing_time_ms,
-            })
-            print(f"  OK: {len(result.text)} chars, {result.processing_time_ms}ms")
+            while True:
+                job = await fetch(client.get_job_async, job_id)
+                if job.is_completed or job.is_failed:
+                    # Returns immediately for finished jobs, raises ProcessingError on failure
+                    return path, await fetch(client.wait_for_result_async, job_id)
+                if not job.is_pending:
+                    raise ProcessingError(f"Job {job.status}", job_id=job_id)
+                if time.monotonic() >= deadline:
+                    raise CloudError(f"Timeout after {MAX_WAIT} seconds", code="TIMEOUT")
+                await asyncio.sleep(POLL_INTERVAL)
         except CloudError as e:
-            results.append({
-                "file": pdf_file.name,
-                "status": "error",
-                "error": str(e),
-            })
-            print(f"  ERROR: {e}")
+            return path, e
+
+    for finished in asyncio.as_completed([wait(path, job_id) for path, job_id in jobs]):
+        path, outcome = await finished
+        name = Path(path).name
+        if isinstance(outcome, ProcessingError):
+            update_job(db, path, status="failed", error=str(outcome))
+            print(f"  {name} ERROR: {outcome}")
+            continue
+        if isinstance(outcome, CloudError):
+            # The job may still finish on the server; keep its id for --resume
+            update_job(db, path, error=str(outcome))
+            print(f"  {name} PENDING: {outcome}")
+            continue
+
+        result_path = RESULTS_DIR / f"{Path(path).stem}.json"
+        result_path.write_text(outcome.text, encoding="utf-8")
+        update_job(db, path, status="completed", result_path=str(result_path))
+        print(f"  {name} OK: {len(outcome.text)} chars, {outcome.processing_time_ms}ms")
+
+
+async def main(resume: bool):
+    # Process all PDFs in a directory
+    if not DOCUMENTS_DIR.exists():
+        print(f"Directory {DOCUMENTS_DIR} not found. Creating sample...")
+        DOCUMENTS_DIR.mkdir(exist_ok=True)
+        print(f"Please add PDF files to {DOCUMENTS_DIR.absolute()}")
+        return
+
+    pdf_files = [str(p) for p in sorted(DOCUMENTS_DIR.glob("*.pdf"))]
+    print(f"Found {len(pdf_files)} PDF files\n")
+
+    db = open_jobs_db(JOBS_DB, resume)
+    db.executemany(
+        "INSERT OR IGNORE INTO jobs (path, status) VALUES (?, 'new')",
+        [(p,) for p in pdf_files],
+    )
+    # On resume, documents that failed before get another attempt
+    db.execute(
+        "UPDATE jobs SET status = 'new', job_id = NULL, error = NULL WHERE status = 'failed'"
+    )
+    db.commit()
+
+    async with CloudClient(api_key=API_KEY, api_secret=API_SECRET) as client:
+        to_submit = [row[0] for row in db.execute("SELECT path FROM jobs WHERE status = 'new'")]
+        sem = asyncio.Semaphore(CONCURRENCY)
+        limiter = RateLimiter(MAX_RPS)
+        await submit_all(client, db, to_submit, sem, limiter)
+
+        submitted = db.execute(
+            "SELECT path, job_id FROM jobs WHERE status = 'submitted'"
+        ).fetchall()
+        print(f"\nWaiting for {len(submitted)} jobs...")
+        await collect_all(client, db, submitted, sem, limiter)
 
     # Summary
+    counts = dict(db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+    db.close()
     print("\n" + "=" * 50)
     print("BATCH PROCESSING SUMMARY")
     print("=" * 50)
-    success = sum(1 for r in results if r["status"] == "success")
-    print(f"Processed: {len(results)} files")
-    print(f"Success: {success}")
-    print(f"Errors: {len(results) - success}")
-
-    client.close()
+    print(f"Processed: {sum(counts.values())} files")
+    print(f"Success: {counts.get('completed', 0)}")
+    print(f"Errors: {counts.get('failed', 0)}")
+    if counts.get("submitted"):
+        print(f"Pending: {counts['submitted']} (run again with --resume)")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="German-OCR batch processing")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"Continue an interrupted run using {JOBS_DB}",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.resume))
@@ -184,7 +184,7 @@ Examples:
     parser.add_argument(
         "--quantization",
         type=str,
-        choices=["none", "4bit", "8bit"],
+        choices=["none", "4bit", "8bit", "awq", "gptq"],
         help="Quantization mode for HuggingFace backend",
     )
 
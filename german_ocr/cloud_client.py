@@ -15,18 +15,26 @@ Entwickelt bei Keyvan.ai
 
 import os
 import time
+import asyncio
 import logging
 from pathlib import Path
 from typing import Optional, Union, BinaryIO, Callable, Any
 from dataclasses import dataclass, field
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import httpx
 
 logger = logging.getLogger(__name__)
 
 
+def _http2_available() -> bool:
+    """Prüft, ob HTTP/2 verfügbar ist (Paket h2, via httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
 # =============================================================================
 # Exceptions
 # =============================================================================
@@ -154,12 +162,25 @@ class CloudClient:
             print(f"Seite {status.current_page}/{status.total_pages}")
 
         result = client.analyze("grosses_dokument.pdf", on_progress=on_progress)
+
+        # Mehrere Dokumente parallel (asyncio)
+        results = await asyncio.gather(
+            client.analyze_async("a.pdf"),
+            client.analyze_async("b.pdf"),
+        )
     """
 
     DEFAULT_BASE_URL = "https://api.german-ocr.de"
     DEFAULT_TIMEOUT = 60
     DEFAULT_POLL_INTERVAL = 1.0
     DEFAULT_MAX_WAIT = 600  # 10 Minuten für große PDFs
+    MAX_CONNECTIONS = 32
+
+    # Server-Fehler, die automatisch wiederholt werden. Nur idempotente
+    # Methoden: ein wiederholter POST /analyze könnte einen Job doppelt anlegen
+    RETRY_STATUS_CODES = {500, 502, 503, 504}
+    RETRY_METHODS = {"GET", "DELETE"}
+    RETRY_BACKOFF = 0.5
 
     # Unterstützte Output-Formate
     OUTPUT_FORMATS = {"json", "markdown", "md", "text", "n8n"}
@@ -206,16 +227,23 @@ class CloudClient:
         ).rstrip("/")
         self.timeout = timeout
 
-        # Session mit Retry-Logik
-        self._session = requests.Session()
-        retry_strategy = Retry(
-            total=max_retries,
-            backoff_factor=0.5,
-            status_forcelist=[500, 502, 503, 504],
+        # Verbindungs-Pool mit Keep-Alive (und HTTP/2, falls verfügbar),
+        # damit aufeinanderfolgende Requests keinen neuen TLS-Handshake brauchen.
+        # Kein eigener Transport: sonst ignoriert httpx HTTP(S)_PROXY/NO_PROXY
+        self._max_retries = max_retries
+        self._http2 = _http2_available()
+        self._limits = httpx.Limits(
+            max_connections=self.MAX_CONNECTIONS,
+            max_keepalive_connections=self.MAX_CONNECTIONS,
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self._session.mount("https://", adapter)
-        self._session.mount("http://", adapter)
+        self._http = httpx.Client(
+            http2=self._http2, limits=self._limits, follow_redirects=True
+        )
+
+        # Async-Client wird erst bei Bedarf erstellt (analyze_async) und ist
+        # an den Event-Loop gebunden, in dem er zuerst benutzt wurde
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
 
         logger.info(f"CloudClient initialisiert: {self.base_url}")
 
@@ -237,13 +265,124 @@ class CloudClient:
         if "timeout" not in kwargs:
             kwargs["timeout"] = self.timeout
 
+        attempt = 0
+        while True:
+            try:
+                response = self._http.request(method, url, **kwargs)
+            except httpx.ConnectError:
+                # Verbindung kam nicht zustande, der Request ist nie angekommen
+                if attempt >= self._max_retries:
+                    raise CloudError("Verbindungsfehler zur API", code="CONNECTION_ERROR")
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            except httpx.TimeoutException:
+                raise CloudError("Request Timeout", code="TIMEOUT")
+            except httpx.TransportError:
+                raise CloudError("Verbindungsfehler zur API", code="CONNECTION_ERROR")
+
+            delay = self._retry_delay(method, response, attempt)
+            if delay is None:
+                return self._handle_response(response)
+            attempt += 1
+            time.sleep(delay)
+
+    def _retry_delay(self, method: str, response: Any, attempt: int) -> Optional[float]:
+        """Wartezeit vor der nächsten Wiederholung, None wenn nicht wiederholt wird."""
+        if (
+            method.upper() not in self.RETRY_METHODS
+            or response.status_code not in self.RETRY_STATUS_CODES
+            or attempt >= self._max_retries
+        ):
+            return None
+        return self._backoff(attempt)
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponentielle Wartezeit vor Wiederholung Nummer attempt + 1."""
+        return self.RETRY_BACKOFF * 2 ** attempt
+
+    def _new_async_client(self) -> httpx.AsyncClient:
+        """Erstellt einen Async-HTTP-Client mit denselben Einstellungen wie der Sync-Client."""
+        return httpx.AsyncClient(
+            http2=self._http2, limits=self._limits, follow_redirects=True
+        )
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Gibt den Async-HTTP-Client für den laufenden Event-Loop zurück.
+
+        Pool-Verbindungen gehören zu einem Event-Loop. Wird der Client in
+        einem neuen Loop benutzt (z.B. mehrere asyncio.run()-Aufrufe), wird
+        der alte Client verworfen und ein neuer erstellt.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is not None and self._async_loop not in (None, loop):
+            self._close_async_client()
+        if self._async_client is None:
+            self._async_client = self._new_async_client()
+        self._async_loop = loop
+        return self._async_client
+
+    def _close_async_client(self) -> None:
+        """Schließt den Async-Client ohne await (für close() und Loop-Wechsel)."""
+        client, loop = self._async_client, self._async_loop
+        self._async_client = None
+        self._async_loop = None
+        if client is None or loop is None or loop.is_closed():
+            # Verbindungen eines beendeten Loops können nicht mehr sauber
+            # geschlossen werden, sie werden mit dem Client freigegeben
+            return
+        if loop.is_running():
+            # Schließen im eigenen Loop einplanen, ohne darauf zu warten
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        elif not self._loop_running_in_thread():
+            loop.run_until_complete(client.aclose())
+        # Sonst läuft in diesem Thread ein anderer Loop; der alte Loop kann
+        # hier nicht gestartet werden und der Client wird nur verworfen
+
+    @staticmethod
+    def _loop_running_in_thread() -> bool:
+        """Prüft, ob im aktuellen Thread ein Event-Loop läuft."""
         try:
-            response = self._session.request(method, url, **kwargs)
-        except requests.exceptions.Timeout:
-            raise CloudError("Request Timeout", code="TIMEOUT")
-        except requests.exceptions.ConnectionError:
-            raise CloudError("Verbindungsfehler zur API", code="CONNECTION_ERROR")
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+
+    async def _request_async(self, method: str, endpoint: str, **kwargs) -> dict:
+        """Führt einen API-Request asynchron aus."""
+        url = f"{self.base_url}/v1{endpoint}"
+
+        if "headers" not in kwargs:
+            kwargs["headers"] = {}
+        kwargs["headers"].update(self._headers())
 
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = self.timeout
+
+        attempt = 0
+        while True:
+            try:
+                response = await self._get_async_client().request(method, url, **kwargs)
+            except httpx.ConnectError:
+                # Verbindung kam nicht zustande, der Request ist nie angekommen
+                if attempt >= self._max_retries:
+                    raise CloudError("Verbindungsfehler zur API", code="CONNECTION_ERROR")
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            except httpx.TimeoutException:
+                raise CloudError("Request Timeout", code="TIMEOUT")
+            except httpx.TransportError:
+                raise CloudError("Verbindungsfehler zur API", code="CONNECTION_ERROR")
+
+            delay = self._retry_delay(method, response, attempt)
+            if delay is None:
+                return self._handle_response(response)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def _handle_response(self, response: Any) -> dict:
+        """Wertet die HTTP-Response aus und wirft passende Exceptions."""
         # Error Handling
         if response.status_code == 401:
             raise AuthenticationError()
@@ -344,6 +483,28 @@ class CloudClient:
         Returns:
             JobStatus mit job_id
         """
+        files, data = self._prepare_submit(
+            file, prompt, output_format, model, filename, provider
+        )
+
+        # Senden
+        response = self._request("POST", "/analyze", files=files, data=data)
+
+        return JobStatus(
+            job_id=response["job_id"],
+            status=response.get("status", "pending"),
+        )
+
+    def _prepare_submit(
+        self,
+        file: Union[str, Path, BinaryIO, bytes],
+        prompt: Optional[str],
+        output_format: str,
+        model: str,
+        filename: Optional[str],
+        provider: Optional[str],
+    ) -> tuple:
+        """Validiert die Parameter und baut Multipart-Files und Formdaten."""
         # Backward compatibility: provider -> model
         if provider is not None:
             logger.warning("Parameter 'provider' ist veraltet. Bitte 'model' verwenden.")
@@ -375,13 +536,7 @@ class CloudClient:
         if prompt:
             data["prompt"] = prompt
 
-        # Senden
-        response = self._request("POST", "/analyze", files=files, data=data)
-
-        return JobStatus(
-            job_id=response["job_id"],
-            status=response.get("status", "pending"),
-        )
+        return files, data
 
     def get_job(self, job_id: str) -> JobStatus:
         """
@@ -525,6 +680,133 @@ class CloudClient:
             on_progress=on_progress,
         )
 
+    async def submit_async(
+        self,
+        file: Union[str, Path, BinaryIO, bytes],
+        prompt: Optional[str] = None,
+        output_format: str = "text",
+        model: str = "cloud_fast",
+        filename: Optional[str] = None,
+        provider: Optional[str] = None,
+    ) -> JobStatus:
+        """
+        Sendet ein Dokument asynchron zur Verarbeitung.
+
+        Parameter wie submit().
+
+        Returns:
+            JobStatus mit job_id
+        """
+        files, data = self._prepare_submit(
+            file, prompt, output_format, model, filename, provider
+        )
+
+        response = await self._request_async("POST", "/analyze", files=files, data=data)
+
+        return JobStatus(
+            job_id=response["job_id"],
+            status=response.get("status", "pending"),
+        )
+
+    async def get_job_async(self, job_id: str) -> JobStatus:
+        """
+        Ruft den Status eines Jobs asynchron ab.
+
+        Args:
+            job_id: ID des Jobs
+
+        Returns:
+            JobStatus mit aktuellem Status
+        """
+        response = await self._request_async("GET", f"/jobs/{job_id}")
+        return JobStatus.from_dict(response)
+
+    async def wait_for_result_async(
+        self,
+        job_id: str,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        on_progress: Optional[Callable[[JobStatus], None]] = None,
+    ) -> CloudResult:
+        """
+        Wartet asynchron auf das Ergebnis eines Jobs.
+
+        Parameter wie wait_for_result(). Während des Wartens blockiert
+        der Event-Loop nicht, andere Jobs können parallel laufen.
+
+        Returns:
+            CloudResult mit dem Ergebnis
+        """
+        start_time = time.monotonic()
+
+        while True:
+            response = await self._request_async("GET", f"/jobs/{job_id}")
+            job = JobStatus.from_dict(response)
+
+            if on_progress:
+                on_progress(job)
+
+            if job.is_completed:
+                return CloudResult.from_job_response(response)
+
+            if job.is_failed:
+                raise ProcessingError(
+                    job.error or "Verarbeitung fehlgeschlagen",
+                    job_id=job_id,
+                )
+
+            elapsed = time.monotonic() - start_time
+            if elapsed >= max_wait:
+                raise CloudError(
+                    f"Timeout nach {max_wait} Sekunden",
+                    code="TIMEOUT",
+                )
+
+            await asyncio.sleep(poll_interval)
+
+    async def analyze_async(
+        self,
+        file: Union[str, Path, BinaryIO, bytes],
+        prompt: Optional[str] = None,
+        output_format: str = "text",
+        model: str = "cloud_fast",
+        filename: Optional[str] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        on_progress: Optional[Callable[[JobStatus], None]] = None,
+        provider: Optional[str] = None,
+    ) -> CloudResult:
+        """
+        Analysiert ein Dokument asynchron und wartet auf das Ergebnis.
+
+        Asynchrone Variante von analyze() für parallele Verarbeitung
+        mehrerer Dokumente, z.B. mit asyncio.gather().
+
+        Beispiel:
+            results = await asyncio.gather(
+                *[client.analyze_async(p) for p in ["a.pdf", "b.pdf"]]
+            )
+        """
+        if provider is not None:
+            model = provider
+
+        job = await self.submit_async(
+            file=file,
+            prompt=prompt,
+            output_format=output_format,
+            model=model,
+            filename=filename,
+        )
+
+        logger.info(f"Job gestartet: {job.job_id}")
+
+        return await self.wait_for_result_async(
+            job_id=job.job_id,
+            poll_interval=poll_interval,
+            max_wait=max_wait,
+            on_progress=on_progress,
+        )
+
     def get_balance(self) -> dict:
         """Ruft den aktuellen Kontostand ab."""
         return self._request("GET", "/balance")
@@ -538,9 +820,27 @@ class CloudClient:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Schließt die Session."""
-        self._session.close()
+        """Schließt Session und Async-Client."""
+        self.close()
 
     def close(self):
-        """Schließt die Session."""
-        self._session.close()
+        """Schließt Session und Async-Client."""
+        self._http.close()
+        self._close_async_client()
+
+    async def aclose(self):
+        """Schließt die Session und den Async-Client."""
+        self._http.close()
+        client = self._async_client
+        self._async_client = None
+        self._async_loop = None
+        if client is not None:
+            await client.aclose()
+
+    async def __aenter__(self):
+        """Async Context Manager Support."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Schließt Session und Async-Client."""
+        await self.aclose()
@@ -1,16 +1,112 @@
 """HuggingFace Transformers backend for German OCR using Qwen2-VL."""
 
+import contextlib
+import functools
+import gc
+import hashlib
+import importlib
 import logging
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import torch
 from PIL import Image
 
-from german_ocr.utils import load_image
+from german_ocr.utils import (
+    limit_image_size,
+    limited_size,
+    load_image,
+    read_image_size,
+    truncate_at_stop,
+)
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PROMPT = "Extrahiere den gesamten Text aus diesem Dokument im Markdown-Format."
+
+DEFAULT_MAX_NEW_TOKENS = 512
+
+# Longer image side (px) that inputs are downscaled to before inference
+DEFAULT_MAX_LONG_SIDE = 1024
+
+# Worker processes used by extract_batch_parallel; each holds a full model copy
+DEFAULT_PARALLEL_WORKERS = 2
+
+# Chunks per worker in extract_batch_parallel, so faster workers pick up more pages
+CHUNKS_PER_WORKER = 4
+
+DEFAULT_RESULT_CACHE_DIR = Path.home() / ".cache" / "german-ocr" / "results"
+
+# Pre-quantized INT4 formats: quantization mode -> (kernel module, pip package)
+PREQUANTIZED_BACKENDS = {
+    "awq": ("awq", "autoawq"),
+    "gptq": ("auto_gptq", "auto-gptq"),
+}
+
+ImageInput = Union[str, Path, Image.Image]
+
+# Edge length (px) of the resolution buckets used to group images for batching
+BUCKET_SIZE = 64
+
+# Number of prepared batches buffered ahead of generation in extract_batch
+PREFETCH_BATCHES = 2
+
+# Models loaded in this process (released by HuggingFaceBackend.clear_model_cache):
+# (model_name, device, quantization, device_map, compile, cache_dir) -> (model, processor)
+_MODEL_CACHE: Dict[Tuple[Any, ...], Tuple[Any, Any]] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+# Shared backend instances returned by HuggingFaceBackend.get_shared
+_SHARED_BACKENDS: Dict[str, "HuggingFaceBackend"] = {}
+
+# Per-process backend used by HuggingFaceBackend.extract_batch_parallel workers
+_worker_backend: Optional["HuggingFaceBackend"] = None
+
+
+@dataclass
+class _PreparedBatch:
+    """A batch of images made ready for generation by the prefetch thread."""
+
+    pending: List[Tuple[int, Image.Image, Optional[str]]] = field(default_factory=list)
+    cached: Dict[int, str] = field(default_factory=dict)
+    errors: Dict[int, Exception] = field(default_factory=dict)
+    inputs: Any = None
+    inputs_error: Optional[Exception] = None
+
+
+def _init_worker(backend_kwargs: Dict[str, Any], num_threads: int) -> None:
+    """Load a HuggingFaceBackend once per worker process.
+
+    Args:
+        backend_kwargs: Keyword arguments for HuggingFaceBackend
+        num_threads: Number of torch threads for this worker
+    """
+    global _worker_backend
+    torch.set_num_threads(num_threads)
+    _worker_backend = HuggingFaceBackend(**backend_kwargs)
+
+
+def _worker_extract(
+    args: Tuple[List[Union[str, Path, Image.Image]], Dict[str, Any]]
+) -> List[Union[str, Dict[str, Any]]]:
+    """Run extract_batch on a chunk of images in a worker process.
+
+    Args:
+        args: Tuple of (images, extract_batch keyword arguments)
+
+    Returns:
+        List of extracted texts or structured dicts
+    """
+    images, extract_kwargs = args
+    assert _worker_backend is not None
+    return _worker_backend.extract_batch(images, **extract_kwargs)
+
 
 class HuggingFaceBackend:
     """HuggingFace Transformers backend for OCR inference.
@@ -21,7 +117,20 @@ class HuggingFaceBackend:
     Args:
         model_name: HuggingFace model identifier
         device: Device to run inference on (auto, cuda, cpu, mps)
-        quantization: Quantization mode (none, 4bit, 8bit)
+        quantization: Quantization mode (none, 4bit, 8bit, awq, gptq). awq and
+            gptq load pre-quantized INT4 checkpoints and need autoawq or
+            auto-gptq installed
+        max_long_side: Downscale images so the longer side is at most this
+            many pixels before inference (None disables resizing)
+        compile: Compile the model forward pass with torch.compile and use a
+            static KV cache (CUDA only)
+        result_cache_dir: Directory of the on-disk OCR result cache
+            (default: ~/.cache/german-ocr/results, requires diskcache)
+        device_map: Accelerate device map for loading the model. Defaults to
+            "auto" on CUDA (shards across GPUs and offloads to CPU when VRAM
+            runs out) and to the selected device otherwise
+        cache_dir: HuggingFace cache directory for model and processor files
+            (default: the HuggingFace cache, e.g. set via HF_HUB_CACHE)
     """
 
     def __init__(
@@ -29,16 +138,32 @@ class HuggingFaceBackend:
         model_name: str = "Keyven/german-ocr",
         device: str = "auto",
         quantization: Optional[str] = None,
+        max_long_side: Optional[int] = DEFAULT_MAX_LONG_SIDE,
+        compile: bool = True,
+        result_cache_dir: Optional[Union[str, Path]] = None,
+        device_map: Optional[Union[str, Dict[str, Any]]] = None,
+        cache_dir: Optional[Union[str, Path]] = None,
     ) -> None:
         """Initialize the HuggingFace backend."""
         self.model_name = model_name
         self.quantization = quantization
+        self.max_long_side = max_long_side
+        self.compile = compile
         self.device = self._get_device(device)
+        self.device_map = device_map
+        self.cache_dir = str(cache_dir) if cache_dir else None
+        self._result_cache = self._open_result_cache(result_cache_dir or DEFAULT_RESULT_CACHE_DIR)
+
+        # Prompts are usually reused across many images; render each template once
+        self._render_prompt = functools.lru_cache(maxsize=128)(  # type: ignore[method-assign]
+            self._render_prompt
+        )
 
         logger.info(f"Loading model {model_name} on device {self.device}...")
         self._load_model()
 
-    def _get_device(self, device: str) -> str:
+    @staticmethod
+    def _get_device(device: str) -> str:
         """Determine the device to use for inference.
 
         Args:
@@ -56,50 +181,525 @@ class HuggingFaceBackend:
                 return "cpu"
         return device
 
+    @staticmethod
+    def _open_result_cache(cache_dir: Union[str, Path]) -> Optional[Any]:
+        """Open the on-disk OCR result cache.
+
+        Args:
+            cache_dir: Directory holding the cache
+
+        Returns:
+            diskcache.Cache instance, or None if diskcache is not installed
+        """
+        try:
+            import diskcache
+        except ImportError:
+            logger.debug("diskcache not installed, OCR result caching disabled")
+            return None
+
+        try:
+            return diskcache.Cache(str(cache_dir))
+        except Exception as e:
+            # e.g. read-only or missing home directory in containers
+            logger.warning(f"Cannot open result cache {cache_dir}, caching disabled: {e}")
+            return None
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Look up a cached result; cache failures count as a miss.
+
+        Args:
+            key: Result cache key
+
+        Returns:
+            Cached text or None
+        """
+        if self._result_cache is None:
+            return None
+        try:
+            return self._result_cache.get(key)
+        except Exception as e:
+            logger.warning(f"Result cache lookup failed: {e}")
+            return None
+
+    def _cache_set(self, key: str, text: str) -> None:
+        """Store a result in the cache; failures are logged and ignored.
+
+        Args:
+            key: Result cache key
+            text: Generated text
+        """
+        if self._result_cache is None:
+            return
+        try:
+            self._result_cache[key] = text
+        except Exception as e:
+            logger.warning(f"Result cache write failed: {e}")
+
+    def _cache_key(
+        self,
+        pil_image: Image.Image,
+        prompt: str,
+        max_new_tokens: int,
+        stop_strings: Optional[List[str]] = None,
+    ) -> str:
+        """Build the result cache key for an image, the model and generation settings.
+
+        Args:
+            pil_image: Image as passed to the model (after resizing)
+            prompt: Prompt used for extraction
+            max_new_tokens: Maximum tokens to generate
+            stop_strings: Strings that end generation early
+
+        Returns:
+            Hex digest identifying the request
+        """
+        digest = hashlib.blake2b()
+        digest.update(f"{pil_image.mode}:{pil_image.size}".encode())
+        digest.update(pil_image.tobytes())
+        digest.update(prompt.encode())
+        # Same model name can mean different weights: a newer hub revision or
+        # another quantization produces different text
+        config = getattr(getattr(self, "model", None), "config", None)
+        commit_hash = getattr(config, "_commit_hash", None)
+        digest.update(f"{self.model_name}@{commit_hash}:{self.quantization}".encode())
+        digest.update(str(max_new_tokens).encode())
+        if stop_strings:
+            digest.update("\0".join(stop_strings).encode())
+        return digest.hexdigest()
+
+    def _get_dtype(self) -> torch.dtype:
+        """Determine the half-precision dtype for the current device.
+
+        Returns:
+            torch.bfloat16 on GPUs that support it, torch.float16 otherwise
+        """
+        if self.device == "cuda" and torch.cuda.is_available() and torch.cuda.is_bf16_supported():
+            return torch.bfloat16
+        return torch.float16
+
+    def _get_attn_implementation(self) -> str:
+        """Select the fused attention kernel to use.
+
+        Returns:
+            "flash_attention_2" on CUDA when flash-attn is installed, else "sdpa"
+        """
+        if self.device == "cuda":
+            try:
+                import flash_attn  # noqa: F401
+
+                return "flash_attention_2"
+            except ImportError:
+                pass
+        return "sdpa"
+
+    def _get_device_map(self) -> Union[str, Dict[str, Any]]:
+        """Determine the accelerate device map used to load the model.
+
+        Returns:
+            The user-supplied device map, "auto" on CUDA, or a map placing
+            the whole model on the selected device
+        """
+        if self.device_map is not None:
+            return self.device_map
+        if self.device == "cuda":
+            return "auto"
+        return {"": self.device}
+
+    def _check_prequantized_backend(self) -> None:
+        """Ensure the kernel package for a pre-quantized checkpoint is installed.
+
+        Raises:
+            ImportError: If the required package is missing
+        """
+        module, package = PREQUANTIZED_BACKENDS[self.quantization]  # type: ignore[index]
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            raise ImportError(
+                f"quantization='{self.quantization}' requires {package}. "
+                f"Install it with: pip install {package}"
+            ) from e
+
     def _load_model(self) -> None:
-        """Load the model and processor.
+        """Load the model and processor, reusing an already loaded copy.
+
+        Loaded models are shared per process, keyed by everything that
+        affects how the weights are loaded, so creating another backend
+        with the same settings does not read the weights again. The
+        weights stay in memory after the backend is deleted; call
+        clear_model_cache() to release them.
 
         Raises:
             RuntimeError: If model loading fails
         """
+        key = (
+            self.model_name,
+            self.device,
+            self.quantization,
+            repr(self.device_map),
+            self.compile,
+            self.cache_dir,
+        )
+
         try:
-            from transformers import Qwen2VLForConditionalGeneration, AutoProcessor
+            with _MODEL_CACHE_LOCK:
+                if key in _MODEL_CACHE:
+                    self.model, self.processor = _MODEL_CACHE[key]
+                    logger.info(f"Reusing loaded model {self.model_name}")
+                else:
+                    self._load_weights()
+                    _MODEL_CACHE[key] = (self.model, self.processor)
+                    logger.info("Model loaded successfully")
 
-            # Load processor
-            self.processor = AutoProcessor.from_pretrained(self.model_name)
+            self._input_device = self._get_input_device()
+            self._gpu_preprocess = (
+                self._input_device.type == "cuda"
+                and type(self.processor.image_processor).__name__.endswith("Fast")
+            )
 
-            # Configure quantization if requested
-            model_kwargs: Dict[str, Any] = {"device_map": "auto"}
+        except Exception as e:
+            raise RuntimeError(f"Failed to load model {self.model_name}: {e}") from e
 
-            if self.quantization == "4bit":
-                from transformers import BitsAndBytesConfig
+    def _load_weights(self) -> None:
+        """Load the processor and model weights from the hub or local cache."""
+        from transformers import Qwen2VLForConditionalGeneration, AutoProcessor
 
-                model_kwargs["quantization_config"] = BitsAndBytesConfig(
-                    load_in_4bit=True,
-                    bnb_4bit_compute_dtype=torch.float16,
-                )
-            elif self.quantization == "8bit":
-                model_kwargs["load_in_8bit"] = True
-            elif self.device != "cpu":
-                model_kwargs["torch_dtype"] = torch.float16
-
-            # Load Qwen2-VL model
-            self.model = Qwen2VLForConditionalGeneration.from_pretrained(
-                self.model_name, **model_kwargs
+        # Load processor (left padding so batched prompts end at the same position).
+        # On CUDA, prefer the torch-based fast image processor so resizing,
+        # normalization and patching run on the GPU. use_fast also selects the
+        # tokenizer implementation, so elsewhere keep the library default.
+        processor_kwargs: Dict[str, Any] = {"cache_dir": self.cache_dir}
+        if self.device == "cuda":
+            processor_kwargs["use_fast"] = True
+        self.processor = AutoProcessor.from_pretrained(self.model_name, **processor_kwargs)
+        self.processor.tokenizer.padding_side = "left"
+
+        # Place the model via accelerate instead of a single .to(device)
+        model_kwargs: Dict[str, Any] = {
+            "device_map": self._get_device_map(),
+            "cache_dir": self.cache_dir,
+        }
+
+        # Configure quantization if requested
+        dtype = self._get_dtype()
+        model_kwargs["attn_implementation"] = self._get_attn_implementation()
+
+        if self.quantization == "4bit":
+            from transformers import BitsAndBytesConfig
+
+            model_kwargs["quantization_config"] = BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_compute_dtype=dtype,
+            )
+        elif self.quantization == "8bit":
+            model_kwargs["load_in_8bit"] = True
+        elif self.quantization in PREQUANTIZED_BACKENDS:
+            # Quantization config comes from the checkpoint itself; the fused
+            # INT4 kernels expect float16 activations
+            self._check_prequantized_backend()
+            model_kwargs["torch_dtype"] = torch.float16
+        elif self.device != "cpu":
+            model_kwargs["torch_dtype"] = dtype
+
+        # Load Qwen2-VL model
+        self.model = Qwen2VLForConditionalGeneration.from_pretrained(
+            self.model_name, **model_kwargs
+        )
+
+        self.model.eval()
+        self._configure_generation()
+
+        if self.compile and self.device == "cuda" and torch.cuda.is_available():
+            self._compile_model()
+
+    def _get_input_device(self) -> torch.device:
+        """Determine the device that model inputs have to be placed on.
+
+        This is the device of the first parameter, i.e. where the embedding
+        layer lives when the model is split across devices. Offloaded
+        parameters (meta device) are fed from CPU by accelerate's hooks.
+
+        Returns:
+            Device for input tensors
+        """
+        device = next(self.model.parameters()).device
+        if device.type == "meta":
+            return torch.device("cpu")
+        return device
+
+    def _configure_generation(self) -> None:
+        """Set the generation defaults once on the model's generation config.
+
+        generate() then reuses this config instead of building and
+        validating a new one from keyword arguments on every call.
+        """
+        config = self.model.generation_config
+        tokenizer = self.processor.tokenizer
+
+        # Greedy decoding; drop sampling parameters shipped with the checkpoint
+        config.do_sample = False
+        config.temperature = None
+        config.top_p = None
+        config.top_k = None
+        config.max_new_tokens = DEFAULT_MAX_NEW_TOKENS
+
+        if config.pad_token_id is None:
+            config.pad_token_id = tokenizer.pad_token_id
+        if config.eos_token_id is None:
+            config.eos_token_id = tokenizer.eos_token_id
+
+    def _compile_model(self) -> None:
+        """Enable a static KV cache and compile the model forward pass.
+
+        A static cache keeps the per-token decode loop free of allocations so
+        torch.compile can capture it as CUDA graphs. Models that do not
+        support a static cache are left uncompiled. torch.compile is lazy, so
+        compilation errors only surface on the first generate() call; see
+        _generate_with_fallback.
+        """
+        if not getattr(self.model, "_supports_static_cache", False):
+            logger.debug(f"{self.model_name} does not support a static cache, skipping compile")
+            return
+
+        placement = set(getattr(self.model, "hf_device_map", {}).values())
+        if len(placement) > 1 or placement & {"cpu", "disk"}:
+            logger.debug("Model is split across devices, skipping compile")
+            return
+
+        eager_forward = self.model.forward
+        try:
+            self.model.generation_config.cache_implementation = "static"
+            self.model.forward = torch.compile(
+                eager_forward, mode="reduce-overhead", fullgraph=False
             )
+            # Kept on the model (shared between backends) until the first
+            # compiled generate() has succeeded
+            self.model._german_ocr_eager_forward = eager_forward
+            logger.info("Compiled model with static KV cache")
+        except Exception as e:
+            self._restore_eager(eager_forward)
+            logger.debug(f"torch.compile not available, using eager mode: {e}")
+
+    def _restore_eager(self, eager_forward: Any) -> None:
+        """Undo _compile_model and return to the eager forward pass.
 
-            self.model.eval()
-            logger.info("Model loaded successfully")
+        Args:
+            eager_forward: The model's original forward method
+        """
+        self.model.forward = eager_forward
+        self.model.generation_config.cache_implementation = None
+        self.model._german_ocr_eager_forward = None
+
+    def _generate_with_fallback(self, inputs: Any, generate_kwargs: Dict[str, Any]) -> Any:
+        """Call model.generate, falling back to eager mode if compilation fails.
 
+        The first generate() after _compile_model triggers the actual
+        compilation (e.g. fails on hosts without a working Triton). In that
+        case the original forward and dynamic cache are restored and the
+        call is retried once without compilation.
+
+        Args:
+            inputs: Processor inputs on the model device
+            generate_kwargs: Per-call generate overrides
+
+        Returns:
+            Generated token ids
+        """
+        eager_forward = getattr(self.model, "_german_ocr_eager_forward", None)
+        try:
+            outputs = self.model.generate(**inputs, **generate_kwargs)
         except Exception as e:
-            raise RuntimeError(f"Failed to load model {self.model_name}: {e}") from e
+            if eager_forward is None:
+                raise
+            logger.warning(f"Compiled generation failed, falling back to eager mode: {e}")
+            self._restore_eager(eager_forward)
+            return self.model.generate(**inputs, **generate_kwargs)
+
+        if eager_forward is not None:
+            # Compilation worked; later errors are real inference errors
+            self.model._german_ocr_eager_forward = None
+        return outputs
+
+    def _render_prompt(self, prompt: str) -> str:
+        """Render the chat template for a single-image prompt.
+
+        The template only contains an image placeholder, which the processor
+        expands per image, so the rendered text depends on the prompt alone
+        and is cached per instance (see __init__).
+
+        Args:
+            prompt: Prompt text
+
+        Returns:
+            Chat-formatted prompt text
+        """
+        messages = [{
+            "role": "user",
+            "content": [
+                {"type": "image"},
+                {"type": "text", "text": prompt}
+            ]
+        }]
+        return self.processor.apply_chat_template(
+            messages, tokenize=False, add_generation_prompt=True
+        )
+
+    def _prepare_inputs(self, pil_images: List[Image.Image], prompt: str) -> Any:
+        """Build processor inputs for a batch of images on the host.
+
+        Args:
+            pil_images: Loaded PIL images, one per sample
+            prompt: Prompt applied to every image
+
+        Returns:
+            Processor output (BatchFeature) with CPU tensors; pixel values
+            are already on the GPU when GPU preprocessing is enabled
+        """
+        from qwen_vl_utils import process_vision_info
+
+        # Prepare inputs using Qwen2-VL chat format
+        messages = [
+            [{
+                "role": "user",
+                "content": [
+                    {"type": "image", "image": pil_image},
+                    {"type": "text", "text": prompt}
+                ]
+            }]
+            for pil_image in pil_images
+        ]
+
+        texts = [self._render_prompt(prompt)] * len(pil_images)
+        image_inputs, video_inputs = process_vision_info(messages)
+
+        # The fast image processor produces pixel_values directly on the GPU
+        image_kwargs = {"device": str(self._input_device)} if self._gpu_preprocess else {}
+        return self.processor(
+            text=texts,
+            images=image_inputs,
+            videos=video_inputs,
+            padding=True,
+            return_tensors="pt",
+            **image_kwargs,
+        )
+
+    def _move_inputs(self, inputs: Any) -> Any:
+        """Move processor inputs to the model device.
+
+        On CUDA the tensors are copied from pinned host memory with
+        non_blocking=True, so the copy is queued on the stream instead of
+        stalling the host until it completes.
+
+        Args:
+            inputs: Processor output with CPU tensors
+
+        Returns:
+            Processor output with tensors on the model device
+        """
+        device = self._input_device
+        if device.type != "cuda":
+            return inputs.to(device)
+
+        for key, value in inputs.items():
+            if isinstance(value, torch.Tensor):
+                if value.device.type == "cpu":
+                    value = value.pin_memory()
+                inputs[key] = value.to(device, non_blocking=True)
+        return inputs
+
+    def _generate(
+        self,
+        pil_images: List[Image.Image],
+        prompt: str,
+        max_new_tokens: int,
+        stop_strings: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Run a single batched generate call over one or more images.
+
+        Args:
+            pil_images: Loaded PIL images, one per sample
+            prompt: Prompt applied to every image
+            max_new_tokens: Maximum tokens to generate
+            stop_strings: Strings that end generation early
+
+        Returns:
+            Generated text for each image, in input order
+        """
+        inputs = self._prepare_inputs(pil_images, prompt)
+        return self._generate_from_inputs(inputs, max_new_tokens, stop_strings)
+
+    def _generate_from_inputs(
+        self,
+        inputs: Any,
+        max_new_tokens: int,
+        stop_strings: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Run generate on prepared processor inputs and decode the output.
+
+        Generation ends at the EOS token, or as soon as one of stop_strings
+        has been produced by every sequence in the batch. The stop string
+        itself is removed from the returned text.
+
+        Args:
+            inputs: Processor output from _prepare_inputs
+            max_new_tokens: Maximum tokens to generate
+            stop_strings: Strings that end generation early
+
+        Returns:
+            Generated text for each sample, in input order
+        """
+        inputs = self._move_inputs(inputs)
+
+        # Defaults live in model.generation_config; only pass per-call overrides
+        generate_kwargs: Dict[str, Any] = {}
+        if max_new_tokens != DEFAULT_MAX_NEW_TOKENS:
+            generate_kwargs["max_new_tokens"] = max_new_tokens
+        if stop_strings:
+            generate_kwargs["stop_strings"] = stop_strings
+            generate_kwargs["tokenizer"] = self.processor.tokenizer
+
+        # Generate
+        with torch.inference_mode():
+            outputs = self._generate_with_fallback(inputs, generate_kwargs)
+
+        # Decode only the newly generated tokens (strip the prompt prefix)
+        texts = self.processor.batch_decode(
+            outputs[:, inputs.input_ids.shape[1]:],
+            skip_special_tokens=True
+        )
+        if stop_strings:
+            texts = [truncate_at_stop(text, stop_strings) for text in texts]
+        return texts
+
+    def _format_result(
+        self, generated_text: str, structured: bool
+    ) -> Union[str, Dict[str, Any]]:
+        """Wrap generated text in the requested output format.
+
+        Args:
+            generated_text: Decoded model output
+            structured: Whether to return structured output (dict)
+
+        Returns:
+            Text as string or structured dict
+        """
+        if structured:
+            return {
+                "text": generated_text,
+                "model": self.model_name,
+                "backend": "huggingface",
+                "confidence": 1.0,
+            }
+        return generated_text
 
     def extract(
         self,
         image: Union[str, Path, Image.Image],
         prompt: Optional[str] = None,
         structured: bool = False,
-        max_new_tokens: int = 512,
+        max_new_tokens: int = DEFAULT_MAX_NEW_TOKENS,
+        use_cache: bool = True,
+        stop_strings: Optional[List[str]] = None,
     ) -> Union[str, Dict[str, Any]]:
         """Extract text from an image using HuggingFace model.
 
@@ -108,6 +708,9 @@ class HuggingFaceBackend:
             prompt: Custom prompt for OCR (optional)
             structured: Whether to return structured output (dict)
             max_new_tokens: Maximum tokens to generate
+            use_cache: Reuse and store results in the on-disk result cache
+            stop_strings: Strings that end generation early (e.g. a closing
+                marker of a JSON template)
 
         Returns:
             Extracted text as string or structured dict
@@ -116,107 +719,409 @@ class HuggingFaceBackend:
             ValueError: If image is invalid
             RuntimeError: If OCR extraction fails
         """
-        # Load image
-        pil_image = load_image(image)
+        # Load image and cap its resolution
+        pil_image = limit_image_size(load_image(image), self.max_long_side)
 
         # Prepare prompt (German for better results)
         if prompt is None:
-            prompt = "Extrahiere den gesamten Text aus diesem Dokument im Markdown-Format."
+            prompt = DEFAULT_PROMPT
 
-        # Prepare inputs using Qwen2-VL chat format
-        try:
-            from qwen_vl_utils import process_vision_info
-
-            messages = [{
-                "role": "user",
-                "content": [
-                    {"type": "image", "image": pil_image},
-                    {"type": "text", "text": prompt}
-                ]
-            }]
+        key = None
+        if use_cache and self._result_cache is not None:
+            key = self._cache_key(pil_image, prompt, max_new_tokens, stop_strings)
+            cached = self._cache_get(key)
+            if cached is not None:
+                return self._format_result(cached, structured)
 
-            text = self.processor.apply_chat_template(
-                messages, tokenize=False, add_generation_prompt=True
-            )
-            image_inputs, video_inputs = process_vision_info(messages)
-            inputs = self.processor(
-                text=[text],
-                images=image_inputs,
-                videos=video_inputs,
-                padding=True,
-                return_tensors="pt"
-            ).to(self.model.device)
-
-            # Generate
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    **inputs,
-                    max_new_tokens=max_new_tokens,
-                    do_sample=False,
-                )
-
-            # Decode output
-            generated_text = self.processor.batch_decode(
-                outputs[:, inputs.input_ids.shape[1]:],
-                skip_special_tokens=True
+        try:
+            generated_text = self._generate(
+                [pil_image], prompt, max_new_tokens, stop_strings
             )[0]
-
-            if structured:
-                return {
-                    "text": generated_text,
-                    "model": self.model_name,
-                    "backend": "huggingface",
-                    "confidence": 1.0,
-                }
-            return generated_text
-
         except Exception as e:
             raise RuntimeError(f"OCR extraction failed: {e}") from e
 
+        if key is not None:
+            self._cache_set(key, generated_text)
+        return self._format_result(generated_text, structured)
+
     def extract_batch(
         self,
         images: List[Union[str, Path, Image.Image]],
         prompt: Optional[str] = None,
         structured: bool = False,
-        max_new_tokens: int = 512,
+        max_new_tokens: int = DEFAULT_MAX_NEW_TOKENS,
         batch_size: int = 1,
+        use_cache: bool = True,
+        stop_strings: Optional[List[str]] = None,
     ) -> List[Union[str, Dict[str, Any]]]:
         """Extract text from multiple images.
 
+        Images are grouped into resolution buckets before batching so that
+        a batch does not pad small pages up to the size of a large one.
+        While one batch is being generated, the next batches are decoded,
+        resized and run through the processor in a background thread.
+        Each batch is run through a single processor and generate call; if
+        a batch fails, its images are retried one at a time. Results are
+        returned in the original input order.
+
         Args:
             images: List of image paths or PIL Image objects
             prompt: Custom prompt for OCR (optional)
             structured: Whether to return structured output
             max_new_tokens: Maximum tokens to generate
             batch_size: Number of images to process at once
+            use_cache: Reuse and store results in the on-disk result cache
+            stop_strings: Strings that end generation early
 
         Returns:
             List of extracted texts or structured dicts
         """
-        results = []
+        if prompt is None:
+            prompt = DEFAULT_PROMPT
 
-        # Process in batches
-        for i in range(0, len(images), batch_size):
-            batch = images[i : i + batch_size]
+        results: List[Optional[Union[str, Dict[str, Any]]]] = [None] * len(images)
+        use_cache = use_cache and self._result_cache is not None
+
+        # Group images by resolution bucket. Only the header is read here and
+        # the file is closed again, so large inputs do not exhaust file handles;
+        # images are opened for real when their batch is prepared
+        buckets: Dict[Tuple[int, int], List[Tuple[int, ImageInput]]] = {}
+        for idx, image in enumerate(images):
+            try:
+                size = read_image_size(image)
+            except Exception as e:
+                logger.error(f"Failed to load image {idx+1}: {e}")
+                results[idx] = self._error_result(e, structured)
+                continue
+            width, height = limited_size(size, self.max_long_side)
+            key = (width // BUCKET_SIZE, height // BUCKET_SIZE)
+            buckets.setdefault(key, []).append((idx, image))
+
+        batches = [
+            bucket[i : i + batch_size]
+            for bucket in buckets.values()
+            for i in range(0, len(bucket), batch_size)
+        ]
+
+        # closing() stops the prefetch thread right away if this loop is left
+        # by an exception, instead of when the generator is garbage collected
+        with contextlib.closing(
+            self._prefetch_batches(batches, prompt, max_new_tokens, use_cache, stop_strings)
+        ) as prepared_batches:
+            for prepared in prepared_batches:
+                for idx, error in prepared.errors.items():
+                    logger.error(f"Failed to load image {idx+1}: {error}")
+                    results[idx] = self._error_result(error, structured)
+                for idx, text in prepared.cached.items():
+                    results[idx] = self._format_result(text, structured)
+                if not prepared.pending:
+                    continue
 
-            for j, image in enumerate(batch):
                 try:
-                    result = self.extract(
-                        image,
-                        prompt=prompt,
-                        structured=structured,
-                        max_new_tokens=max_new_tokens,
+                    if prepared.inputs_error is not None:
+                        raise prepared.inputs_error
+                    generated = self._generate_from_inputs(
+                        prepared.inputs, max_new_tokens, stop_strings
                     )
-                    results.append(result)
-                    logger.info(f"Processed image {i+j+1}/{len(images)}")
                 except Exception as e:
-                    logger.error(f"Failed to process image {i+j+1}: {e}")
-                    if structured:
-                        results.append(
-                            {"text": "", "error": str(e), "backend": "huggingface"}
+                    if len(prepared.pending) == 1:
+                        idx = prepared.pending[0][0]
+                        logger.error(f"Failed to process image {idx+1}: {e}")
+                        results[idx] = self._error_result(e, structured)
+                        continue
+                    logger.warning(f"Batch failed ({e}), retrying one by one")
+                else:
+                    for (idx, _, key), text in zip(prepared.pending, generated):
+                        if key is not None:
+                            self._cache_set(key, text)
+                        results[idx] = self._format_result(text, structured)
+                    logger.info(f"Processed {len(prepared.pending)} image(s), {len(images)} total")
+                    continue
+
+                for idx, pil_image, _ in prepared.pending:
+                    try:
+                        results[idx] = self.extract(
+                            pil_image,
+                            prompt=prompt,
+                            structured=structured,
+                            max_new_tokens=max_new_tokens,
+                            use_cache=use_cache,
+                            stop_strings=stop_strings,
                         )
-                    else:
-                        results.append("")
+                        logger.info(f"Processed image {idx+1}/{len(images)}")
+                    except Exception as e:
+                        logger.error(f"Failed to process image {idx+1}: {e}")
+                        results[idx] = self._error_result(e, structured)
+
+        return results  # type: ignore[return-value]
+
+    def _prefetch_batches(
+        self,
+        batches: List[List[Tuple[int, ImageInput]]],
+        prompt: str,
+        max_new_tokens: int,
+        use_cache: bool,
+        stop_strings: Optional[List[str]] = None,
+    ) -> Iterator["_PreparedBatch"]:
+        """Prepare batches in a background thread, one step ahead of generation.
+
+        Image decoding, resizing and the processor run mostly in C code that
+        releases the GIL, so a producer thread keeps the next batches ready
+        while the model generates the current one.
+
+        Args:
+            batches: Batches of (index, image) pairs
+            prompt: Prompt applied to every image
+            max_new_tokens: Maximum tokens to generate (part of the cache key)
+            use_cache: Whether to look up results in the result cache
+            stop_strings: Strings that end generation early (part of the cache key)
+
+        Yields:
+            Prepared batches in the order of batches
+        """
+        prepared_queue: "queue.Queue[Optional[_PreparedBatch]]" = queue.Queue(
+            maxsize=PREFETCH_BATCHES
+        )
+
+        producer_errors: List[BaseException] = []
+        # Set when the consumer stops iterating early (error, KeyboardInterrupt)
+        stopped = threading.Event()
+
+        def put(item: Optional[_PreparedBatch]) -> bool:
+            # Wait for queue space, but give up once the consumer has gone
+            while not stopped.is_set():
+                try:
+                    prepared_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            try:
+                # GPU preprocessing runs on a side stream so it overlaps with generate
+                stream = (
+                    torch.cuda.stream(torch.cuda.Stream(self._input_device))
+                    if self._gpu_preprocess
+                    else contextlib.nullcontext()
+                )
+                with stream:
+                    for batch in batches:
+                        prepared = self._prepare_batch(
+                            batch, prompt, max_new_tokens, use_cache, stop_strings
+                        )
+                        if not put(prepared):
+                            break
+            except BaseException as e:
+                producer_errors.append(e)
+            finally:
+                # Always unblock the consumer, even if preparation failed
+                put(None)
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+
+        try:
+            while True:
+                prepared = prepared_queue.get()
+                if prepared is None:
+                    break
+                yield prepared
+        finally:
+            stopped.set()
+            producer.join()
+            # Release batches prepared ahead, including inputs already on the GPU
+            while not prepared_queue.empty():
+                prepared_queue.get_nowait()
+
+        if producer_errors:
+            raise producer_errors[0]
+
+    def _prepare_batch(
+        self,
+        batch: List[Tuple[int, ImageInput]],
+        prompt: str,
+        max_new_tokens: int,
+        use_cache: bool,
+        stop_strings: Optional[List[str]] = None,
+    ) -> "_PreparedBatch":
+        """Decode and resize a batch, serve cache hits and build model inputs.
+
+        Args:
+            batch: (index, image) pairs
+            prompt: Prompt applied to every image
+            max_new_tokens: Maximum tokens to generate (part of the cache key)
+            use_cache: Whether to look up results in the result cache
+            stop_strings: Strings that end generation early (part of the cache key)
+
+        Returns:
+            Prepared batch
+        """
+        prepared = _PreparedBatch()
+
+        for idx, image in batch:
+            try:
+                # load() decodes the pixels and closes the underlying file
+                pil_image = limit_image_size(load_image(image), self.max_long_side)
+                pil_image.load()
+                key = None
+                if use_cache:
+                    key = self._cache_key(pil_image, prompt, max_new_tokens, stop_strings)
+                    cached = self._cache_get(key)
+                    if cached is not None:
+                        prepared.cached[idx] = cached
+                        continue
+                prepared.pending.append((idx, pil_image, key))
+            except Exception as e:
+                prepared.errors[idx] = e
+
+        if prepared.pending:
+            try:
+                prepared.inputs = self._prepare_inputs(
+                    [pil_image for _, pil_image, _ in prepared.pending], prompt
+                )
+                if self._gpu_preprocess:
+                    # Hand over only finished tensors to the generating stream
+                    torch.cuda.current_stream(self._input_device).synchronize()
+            except Exception as e:
+                prepared.inputs_error = e
+
+        return prepared
+
+    @staticmethod
+    def _error_result(error: Exception, structured: bool) -> Union[str, Dict[str, Any]]:
+        """Build the placeholder result for an image that failed.
+
+        Args:
+            error: Exception raised while processing the image
+            structured: Whether to return structured output
+
+        Returns:
+            Empty string or structured error dict
+        """
+        if structured:
+            return {"text": "", "error": str(error), "backend": "huggingface"}
+        return ""
+
+    @classmethod
+    def get_shared(cls, **kwargs: Any) -> "HuggingFaceBackend":
+        """Return a process-wide backend instance for the given settings.
+
+        The first call creates the backend; later calls with the same
+        arguments return the same instance, so scripts and servers pay the
+        model load only once. Use clear_model_cache() to drop it again.
+
+        Args:
+            **kwargs: HuggingFaceBackend constructor arguments
+
+        Returns:
+            Shared HuggingFaceBackend instance
+
+        Example:
+            >>> backend = HuggingFaceBackend.get_shared(model_name="Keyven/german-ocr")
+        """
+        key = repr(sorted(kwargs.items()))
+        with _MODEL_CACHE_LOCK:
+            backend = _SHARED_BACKENDS.get(key)
+        if backend is None:
+            backend = cls(**kwargs)
+            with _MODEL_CACHE_LOCK:
+                backend = _SHARED_BACKENDS.setdefault(key, backend)
+        return backend
+
+    @classmethod
+    def clear_model_cache(cls) -> None:
+        """Release all models and shared backends held by this process.
+
+        Backends created afterwards load their weights again. Existing
+        backend instances keep working with the model they already hold;
+        the memory is only freed once they are deleted as well.
+
+        Example:
+            >>> HuggingFaceBackend.clear_model_cache()
+        """
+        with _MODEL_CACHE_LOCK:
+            _MODEL_CACHE.clear()
+            _SHARED_BACKENDS.clear()
+
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    @classmethod
+    def extract_batch_parallel(
+        cls,
+        images: List[Union[str, Path, Image.Image]],
+        model_name: str = "Keyven/german-ocr",
+        workers: Optional[int] = None,
+        prompt: Optional[str] = None,
+        structured: bool = False,
+        max_new_tokens: int = DEFAULT_MAX_NEW_TOKENS,
+        device: str = "auto",
+        **backend_kwargs: Any,
+    ) -> List[Union[str, Dict[str, Any]]]:
+        """Extract text from multiple images using a pool of CPU processes.
+
+        On CPU, generate() is single-stream and bound by the GIL, so images
+        are split into chunks and processed by separate worker processes,
+        each loading its own copy of the model. Memory use therefore grows
+        with the number of workers, so only a few are started by default;
+        raise workers only if there is RAM for that many models. On GPU
+        devices the images are processed in-process with extract_batch
+        instead.
+
+        Workers are started with the "spawn" method and re-import the
+        calling module, so scripts must call this from behind an
+        ``if __name__ == "__main__":`` guard.
+
+        Args:
+            images: List of image paths or PIL Image objects
+            model_name: HuggingFace model identifier
+            workers: Number of worker processes (default:
+                DEFAULT_PARALLEL_WORKERS, at most the CPU count)
+            prompt: Custom prompt for OCR (optional)
+            structured: Whether to return structured output
+            max_new_tokens: Maximum tokens to generate
+            device: Device to run inference on (auto, cuda, cpu, mps)
+            **backend_kwargs: Additional HuggingFaceBackend arguments
+
+        Returns:
+            List of extracted texts or structured dicts, in input order
+        """
+        backend_kwargs.update(model_name=model_name, device=device)
+        extract_kwargs = {
+            "prompt": prompt,
+            "structured": structured,
+            "max_new_tokens": max_new_tokens,
+        }
+
+        if cls._get_device(device) != "cpu":
+            return cls(**backend_kwargs).extract_batch(images, **extract_kwargs)
+
+        if not images:
+            return []
+
+        # Paths are passed through and decoded by the workers, so the parent
+        # neither holds every page in memory nor keeps their files open
+        cpu_count = os.cpu_count() or 1
+        workers = workers or min(DEFAULT_PARALLEL_WORKERS, cpu_count)
+        workers = max(1, min(workers, len(images)))
+        chunk_size = -(-len(images) // (workers * CHUNKS_PER_WORKER))
+        chunks = [
+            (images[i : i + chunk_size], extract_kwargs)
+            for i in range(0, len(images), chunk_size)
+        ]
+
+        # Spawn fresh interpreters instead of forking a process holding torch state
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(backend_kwargs, max(1, cpu_count // workers)),
+        ) as executor:
+            results: List[Union[str, Dict[str, Any]]] = []
+            for chunk_results in executor.map(_worker_extract, chunks):
+                results.extend(chunk_results)
 
         return results
 
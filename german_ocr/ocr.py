@@ -22,8 +22,9 @@ class GermanOCR:
         backend: Backend to use ('auto', 'ollama', 'huggingface', 'hf', 'llamacpp', 'llama.cpp')
         model_name: Model name for the selected backend
         device: Device selection ('auto', 'cuda', 'cpu', 'mps', 'metal', 'vulkan', 'openvino')
-        quantization: Quantization mode for HF backend ('none', '4bit', '8bit')
+        quantization: Quantization mode for HF backend ('none', '4bit', '8bit', 'awq', 'gptq')
         n_gpu_layers: GPU layers for llama.cpp (-1=all, 0=CPU only)
+        model_dir: Model directory for llama.cpp, HuggingFace cache directory for HF
         log_level: Logging level ('DEBUG', 'INFO', 'WARNING', 'ERROR')
 
     Example:
@@ -69,7 +70,7 @@ class GermanOCR:
         if backend == "ollama":
             self._init_ollama(model_name)
         elif backend == "huggingface":
-            self._init_huggingface(model_name, device, quantization)
+            self._init_huggingface(model_name, device, quantization, model_dir)
         elif backend == "llamacpp":
             self._init_llamacpp(model_name, device, n_gpu_layers, model_dir)
         else:
@@ -141,6 +142,7 @@ class GermanOCR:
         model_name: Optional[str],
         device: str,
         quantization: Optional[str],
+        model_dir: Optional[str] = None,
     ) -> None:
         """Initialize HuggingFace backend.
 
@@ -148,6 +150,7 @@ class GermanOCR:
             model_name: HuggingFace model identifier (optional)
             device: Device to use for inference
             quantization: Quantization mode
+            model_dir: HuggingFace cache directory (optional)
         """
         from german_ocr.hf_backend import HuggingFaceBackend
 
@@ -156,7 +159,7 @@ class GermanOCR:
 
         try:
             self._backend = HuggingFaceBackend(
-                model_name=model, device=device, quantization=quantization
+                model_name=model, device=device, quantization=quantization, cache_dir=model_dir
             )
             logger.info(f"Initialized HuggingFace backend with model: {model}")
         except Exception as e:
@@ -2,7 +2,7 @@
 
 import logging
 from pathlib import Path
-from typing import Union
+from typing import List, Optional, Tuple, Union
 
 from PIL import Image
 
@@ -40,6 +40,96 @@ def load_image(image_input: Union[str, Path, Image.Image]) -> Image.Image:
         raise ValueError(f"Failed to load image from {image_path}: {e}") from e
 
 
+def read_image_size(image_input: Union[str, Path, Image.Image]) -> Tuple[int, int]:
+    """Read the size of an image without keeping its file open.
+
+    Only the image header is read; the file is closed before returning.
+
+    Args:
+        image_input: Path to image file or PIL Image object
+
+    Returns:
+        Image (width, height)
+
+    Raises:
+        FileNotFoundError: If the image file does not exist
+        ValueError: If the image cannot be opened
+    """
+    if isinstance(image_input, Image.Image):
+        return image_input.size
+
+    image_path = Path(image_input)
+    if not image_path.exists():
+        raise FileNotFoundError(f"Image file not found: {image_path}")
+
+    try:
+        with Image.open(image_path) as image:
+            return image.size
+    except Exception as e:
+        raise ValueError(f"Failed to load image from {image_path}: {e}") from e
+
+
+def limited_size(size: Tuple[int, int], max_long_side: Optional[int]) -> Tuple[int, int]:
+    """Compute the size an image will have after limit_image_size.
+
+    Args:
+        size: Original (width, height)
+        max_long_side: Maximum length of the longer side in pixels
+            (None or 0 disables resizing)
+
+    Returns:
+        Resulting (width, height)
+    """
+    width, height = size
+    if not max_long_side:
+        return size
+
+    scale = max_long_side / max(width, height)
+    if scale >= 1:
+        return size
+
+    return (max(1, int(width * scale)), max(1, int(height * scale)))
+
+
+def limit_image_size(image: Image.Image, max_long_side: Optional[int]) -> Image.Image:
+    """Downscale an image so its longer side is at most max_long_side pixels.
+
+    The aspect ratio is preserved. Images that are already small enough
+    are returned unchanged.
+
+    Args:
+        image: PIL Image object
+        max_long_side: Maximum length of the longer side in pixels
+            (None or 0 disables resizing)
+
+    Returns:
+        PIL Image object
+    """
+    new_size = limited_size(image.size, max_long_side)
+    if new_size == image.size:
+        return image
+
+    return image.resize(new_size, Image.LANCZOS)
+
+
+def truncate_at_stop(text: str, stop_strings: List[str]) -> str:
+    """Cut text at the first occurrence of any stop string.
+
+    Args:
+        text: Generated text
+        stop_strings: Strings that end generation
+
+    Returns:
+        Text before the earliest stop string
+    """
+    end = len(text)
+    for stop in stop_strings:
+        pos = text.find(stop)
+        if pos != -1:
+            end = min(end, pos)
+    return text[:end]
+
+
 def setup_logging(level: str = "INFO") -> None:
     """Configure logging for the package.
 
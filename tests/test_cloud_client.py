@@ -5,6 +5,8 @@ Entwickelt bei Keyvan.ai
 """
 
 import os
+import asyncio
+import httpx
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
@@ -125,7 +127,7 @@ class TestCloudClientMethods:
         assert headers["Authorization"] == "Bearer test-key"
         assert "User-Agent" in headers
 
-    @patch("requests.Session.request")
+    @patch("httpx.Client.request")
     def test_submit_success(self, mock_request, client):
         """Test: submit() erfolgreich."""
         mock_response = Mock()
@@ -147,7 +149,7 @@ class TestCloudClientMethods:
         finally:
             test_file.unlink()
 
-    @patch("requests.Session.request")
+    @patch("httpx.Client.request")
     def test_get_job(self, mock_request, client):
         """Test: get_job() erfolgreich."""
         mock_response = Mock()
@@ -163,7 +165,7 @@ class TestCloudClientMethods:
         assert status.job_id == "job-123"
         assert status.is_completed
 
-    @patch("requests.Session.request")
+    @patch("httpx.Client.request")
     def test_cancel_job(self, mock_request, client):
         """Test: cancel_job() erfolgreich."""
         mock_response = Mock()
@@ -174,7 +176,7 @@ class TestCloudClientMethods:
         result = client.cancel_job("job-123")
         assert result is True
 
-    @patch("requests.Session.request")
+    @patch("httpx.Client.request")
     def test_error_401_raises_auth_error(self, mock_request, client):
         """Test: 401 wirft AuthenticationError."""
         mock_response = Mock()
@@ -184,7 +186,7 @@ class TestCloudClientMethods:
         with pytest.raises(AuthenticationError):
             client.get_job("job-123")
 
-    @patch("requests.Session.request")
+    @patch("httpx.Client.request")
     def test_error_402_raises_balance_error(self, mock_request, client):
         """Test: 402 wirft InsufficientBalanceError."""
         mock_response = Mock()
@@ -194,7 +196,7 @@ class TestCloudClientMethods:
         with pytest.raises(InsufficientBalanceError):
             client.get_job("job-123")
 
-    @patch("requests.Session.request")
+    @patch("httpx.Client.request")
     def test_error_429_raises_rate_limit_error(self, mock_request, client):
         """Test: 429 wirft RateLimitError."""
         mock_response = Mock()
@@ -265,6 +267,212 @@ class TestFileValidation:
             assert ext in client.ALLOWED_EXTENSIONS
 
 
+class TestRetry:
+    """Tests für automatische Wiederholungen bei Server-Fehlern."""
+
+    @pytest.fixture
+    def client(self):
+        client = CloudClient(api_key="test-key", api_secret="test-secret", max_retries=3)
+        client.RETRY_BACKOFF = 0
+        return client
+
+    def _mock_transport(self, client, handler):
+        client._http = httpx.Client(transport=httpx.MockTransport(handler))
+
+    def test_get_retried_on_5xx(self, client):
+        """Test: GET wird bei 503 wiederholt."""
+        calls = []
+
+        def handler(request):
+            calls.append(request.method)
+            if len(calls) < 3:
+                return httpx.Response(503)
+            return httpx.Response(200, json={"job_id": "job-123", "status": "completed"})
+
+        self._mock_transport(client, handler)
+
+        assert client.get_job("job-123").is_completed
+        assert calls == ["GET", "GET", "GET"]
+
+    def test_post_not_retried_on_5xx(self, client, tmp_path):
+        """Test: POST /analyze wird bei 504 nicht wiederholt (keine doppelten Jobs)."""
+        test_file = tmp_path / "test_image.png"
+        test_file.write_bytes(b"fake image data")
+        calls = []
+
+        def handler(request):
+            calls.append(request.method)
+            return httpx.Response(504)
+
+        self._mock_transport(client, handler)
+
+        with pytest.raises(CloudError):
+            client.submit(test_file)
+        assert calls == ["POST"]
+
+    def test_connect_error_retried(self, client, tmp_path):
+        """Test: Verbindungsfehler werden auch bei POST wiederholt."""
+        test_file = tmp_path / "test_image.png"
+        test_file.write_bytes(b"fake image data")
+        calls = []
+
+        def handler(request):
+            calls.append(request.method)
+            if len(calls) < 3:
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(200, json={"job_id": "job-123", "status": "pending"})
+
+        self._mock_transport(client, handler)
+
+        assert client.submit(test_file).job_id == "job-123"
+        assert calls == ["POST", "POST", "POST"]
+
+    def test_connect_error_gives_up(self, client):
+        """Test: Nach max_retries Verbindungsfehlern wird CloudError geworfen."""
+        calls = []
+
+        def handler(request):
+            calls.append(request.method)
+            raise httpx.ConnectError("connection refused", request=request)
+
+        self._mock_transport(client, handler)
+
+        with pytest.raises(CloudError) as exc_info:
+            client.get_job("job-123")
+        assert exc_info.value.code == "CONNECTION_ERROR"
+        assert len(calls) == 4
+
+
+class TestHttpClient:
+    """Tests für die Konfiguration des HTTP-Clients."""
+
+    def test_follows_redirects(self):
+        """Test: Redirects (z.B. http -> https) werden verfolgt."""
+        client = CloudClient(
+            api_key="test-key", api_secret="test-secret", base_url="http://api.example.com"
+        )
+
+        def handler(request):
+            if request.url.scheme == "http":
+                return httpx.Response(
+                    301, headers={"Location": str(request.url.copy_with(scheme="https"))}
+                )
+            return httpx.Response(200, json={"job_id": "job-123", "status": "completed"})
+
+        client._http._transport = httpx.MockTransport(handler)
+
+        assert client.get_job("job-123").is_completed
+
+    def test_uses_proxy_from_environment(self, monkeypatch):
+        """Test: HTTPS_PROXY aus der Umgebung wird berücksichtigt."""
+        monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example.com:3128")
+        client = CloudClient(api_key="test-key", api_secret="test-secret")
+
+        transport = client._http._transport_for_url(httpx.URL(client.base_url))
+        assert transport is not client._http._transport
+
+
+class TestCloudClientAsync:
+    """Tests für die asynchronen CloudClient Methoden."""
+
+    @pytest.fixture
+    def client(self):
+        return CloudClient(api_key="test-key", api_secret="test-secret")
+
+    def _mock_transport(self, client, handler):
+        client._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def test_analyze_async(self, client, tmp_path):
+        """Test: analyze_async() sendet, pollt und liefert das Ergebnis."""
+        test_file = tmp_path / "test_image.png"
+        test_file.write_bytes(b"fake image data")
+        polls = []
+
+        def handler(request):
+            if request.method == "POST":
+                return httpx.Response(200, json={"job_id": "job-123", "status": "pending"})
+            polls.append(request.url.path)
+            if len(polls) < 2:
+                return httpx.Response(200, json={"job_id": "job-123", "status": "processing"})
+            return httpx.Response(
+                200,
+                json={"job_id": "job-123", "status": "completed", "result": "Rechnung"},
+            )
+
+        self._mock_transport(client, handler)
+
+        result = asyncio.run(client.analyze_async(test_file, poll_interval=0))
+        assert result.job_id == "job-123"
+        assert result.text == "Rechnung"
+        assert polls == ["/v1/jobs/job-123", "/v1/jobs/job-123"]
+
+    def test_error_429_raises_rate_limit_error(self, client):
+        """Test: 429 wirft RateLimitError auch asynchron."""
+        def handler(request):
+            return httpx.Response(429, json={"message": "Too many requests", "retry_after": 30})
+
+        self._mock_transport(client, handler)
+
+        with pytest.raises(RateLimitError) as exc_info:
+            asyncio.run(client.get_job_async("job-123"))
+        assert exc_info.value.retry_after == 30
+
+    def test_reuse_across_event_loops(self, client):
+        """Test: Der Client funktioniert in mehreren asyncio.run()-Aufrufen."""
+        def handler(request):
+            return httpx.Response(200, json={"job_id": "job-123", "status": "processing"})
+
+        client._new_async_client = lambda: httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+
+        first = asyncio.run(client.get_job_async("job-123"))
+        first_client = client._async_client
+        second = asyncio.run(client.get_job_async("job-123"))
+
+        assert first.status == second.status == "processing"
+        assert client._async_client is not first_client
+
+    def test_switch_from_open_idle_loop(self, client):
+        """Test: Ein noch offener, aber ruhender alter Loop stört den neuen nicht."""
+        def handler(request):
+            return httpx.Response(200, json={"job_id": "job-123", "status": "processing"})
+
+        client._new_async_client = lambda: httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+        old_loop = asyncio.new_event_loop()
+        try:
+            old_loop.run_until_complete(client.get_job_async("job-123"))
+            old_client = client._async_client
+
+            job = asyncio.run(client.get_job_async("job-123"))
+        finally:
+            old_loop.close()
+
+        assert job.status == "processing"
+        assert client._async_client is not old_client
+
+    def test_close_closes_async_client(self, client):
+        """Test: close() schließt auch den Async-Client."""
+        def handler(request):
+            return httpx.Response(200, json={"job_id": "job-123", "status": "processing"})
+
+        client._new_async_client = lambda: httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(client.get_job_async("job-123"))
+            async_client = client._async_client
+            client.close()
+        finally:
+            loop.close()
+
+        assert async_client.is_closed
+        assert client._async_client is None
+
+
 class TestContextManager:
     """Tests für Context Manager Support."""
 
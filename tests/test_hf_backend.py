@@ -0,0 +1,158 @@
+"""
+Tests für die Batch-Verarbeitung des HuggingFace-Backends.
+
+Modell und Processor werden durch Attrappen ersetzt, es werden keine
+Gewichte geladen.
+
+Entwickelt bei Keyvan.ai
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+torch = pytest.importorskip("torch")
+
+from german_ocr.hf_backend import HuggingFaceBackend  # noqa: E402
+
+
+class FakeInputs(dict):
+    """Processor-Ausgabe mit input_ids, die Bildgrößen als Token-IDs enthält."""
+
+    @property
+    def input_ids(self):
+        return self["input_ids"]
+
+    def to(self, device):
+        return self
+
+
+class FakeProcessor:
+    """Dekodiert jede Token-ID zur Größe des zugehörigen Bildes."""
+
+    def __init__(self):
+        self.texts = []
+
+    def encode_images(self, pil_images):
+        ids = []
+        for pil_image in pil_images:
+            self.texts.append(f"{pil_image.width}x{pil_image.height}")
+            ids.append([len(self.texts) - 1])
+        return FakeInputs(input_ids=torch.tensor(ids))
+
+    def batch_decode(self, token_ids, skip_special_tokens=True):
+        return [self.texts[row[0]] for row in token_ids.tolist()]
+
+
+class FakeModel:
+    """generate() hängt an jeden Prompt ein Token mit derselben ID an."""
+
+    def __init__(self, fail_batches=False):
+        self.fail_batches = fail_batches
+        self.batch_sizes = []
+        self.generation_config = SimpleNamespace(cache_implementation=None)
+
+    def generate(self, input_ids, **kwargs):
+        self.batch_sizes.append(len(input_ids))
+        if self.fail_batches and len(input_ids) > 1:
+            raise RuntimeError("CUDA out of memory")
+        return torch.tensor([[row[0], row[0]] for row in input_ids.tolist()])
+
+
+def make_backend(model=None, result_cache=None):
+    """Erstellt ein Backend ohne __init__, also ohne Modell-Download."""
+    backend = object.__new__(HuggingFaceBackend)
+    backend.model_name = "Keyven/german-ocr"
+    backend.quantization = None
+    backend.max_long_side = 1024
+    backend.model = model or FakeModel()
+    backend.processor = FakeProcessor()
+    backend._result_cache = result_cache
+    backend._input_device = torch.device("cpu")
+    backend._gpu_preprocess = False
+    backend._prepare_inputs = lambda pil_images, prompt: backend.processor.encode_images(
+        pil_images
+    )
+    return backend
+
+
+SIZES = [(100, 80), (900, 600), (110, 80), (2000, 1500), (905, 600), (100, 85)]
+
+
+def make_images():
+    return [Image.new("RGB", size) for size in SIZES]
+
+
+class TestExtractBatch:
+    """Tests für HuggingFaceBackend.extract_batch()."""
+
+    def test_results_in_input_order(self):
+        """Test: Ergebnisse kommen trotz Größen-Buckets in Eingabereihenfolge zurück."""
+        backend = make_backend()
+
+        results = backend.extract_batch(make_images(), batch_size=2)
+
+        # 2000x1500 wird auf die Grenze von 1024 Pixeln verkleinert
+        assert results == ["100x80", "900x600", "110x80", "1024x768", "905x600", "100x85"]
+
+    def test_batches_do_not_mix_buckets(self):
+        """Test: Ein Batch enthält nur Bilder aus demselben Größen-Bucket."""
+        model = FakeModel()
+        backend = make_backend(model)
+
+        backend.extract_batch(make_images(), batch_size=8)
+
+        assert sorted(model.batch_sizes) == [1, 2, 3]
+
+    def test_unreadable_image_only_affects_its_index(self, tmp_path):
+        """Test: Eine fehlende Datei ergibt nur an ihrer Position einen Platzhalter."""
+        backend = make_backend()
+        images = make_images()
+        images.insert(2, tmp_path / "fehlt.png")
+
+        results = backend.extract_batch(images, batch_size=2, structured=True)
+
+        assert results[2]["text"] == ""
+        assert "error" in results[2]
+        assert [r["text"] for i, r in enumerate(results) if i != 2] == [
+            "100x80", "900x600", "110x80", "1024x768", "905x600", "100x85"
+        ]
+
+    def test_failed_batch_retried_one_by_one(self):
+        """Test: Schlägt ein Batch fehl, wird jedes Bild einzeln wiederholt."""
+        model = FakeModel(fail_batches=True)
+        backend = make_backend(model)
+
+        results = backend.extract_batch(make_images(), batch_size=8)
+
+        assert results == ["100x80", "900x600", "110x80", "1024x768", "905x600", "100x85"]
+        assert model.batch_sizes.count(1) == len(SIZES)
+
+    def test_producer_error_is_raised(self):
+        """Test: Fehler im Prefetch-Thread werden weitergegeben statt zu blockieren."""
+        backend = make_backend()
+
+        def fail(*args, **kwargs):
+            raise MemoryError("kein Speicher")
+
+        backend._prepare_batch = fail
+
+        with pytest.raises(MemoryError):
+            backend.extract_batch(make_images(), batch_size=2)
+
+    def test_cache_hit_skips_generate(self):
+        """Test: Treffer im Ergebnis-Cache rufen generate() nicht erneut auf."""
+        model = FakeModel()
+        backend = make_backend(model, result_cache={})
+
+        first = backend.extract_batch(make_images(), batch_size=2)
+        generate_calls = len(model.batch_sizes)
+        second = backend.extract_batch(make_images(), batch_size=2)
+
+        assert second == first
+        assert len(model.batch_sizes) == generate_calls
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,95 @@
+"""
+Tests für die Hilfsfunktionen in german_ocr.utils.
+
+Entwickelt bei Keyvan.ai
+"""
+
+import pytest
+from PIL import Image
+
+from german_ocr.utils import limit_image_size, limited_size, truncate_at_stop
+
+
+class TestLimitedSize:
+    """Tests für limited_size()."""
+
+    def test_below_cap_unchanged(self):
+        """Test: Bilder unterhalb der Grenze behalten ihre Größe."""
+        assert limited_size((800, 600), 1024) == (800, 600)
+
+    def test_exactly_at_cap_unchanged(self):
+        """Test: Bilder genau an der Grenze werden nicht skaliert."""
+        assert limited_size((1024, 512), 1024) == (1024, 512)
+
+    def test_landscape_scaled_to_cap(self):
+        """Test: Lange Seite (Breite) wird auf die Grenze skaliert."""
+        assert limited_size((3000, 2000), 1024) == (1024, 682)
+
+    def test_portrait_scaled_to_cap(self):
+        """Test: Lange Seite (Höhe) wird auf die Grenze skaliert."""
+        assert limited_size((2480, 3508), 1024) == (723, 1024)
+
+    def test_aspect_ratio_rounds_down(self):
+        """Test: Die kurze Seite wird abgerundet."""
+        width, height = limited_size((3000, 1001), 1024)
+        assert width == 1024
+        assert height == int(1001 * 1024 / 3000)
+
+    def test_extreme_aspect_ratio_keeps_one_pixel(self):
+        """Test: Sehr schmale Bilder behalten mindestens 1 Pixel."""
+        assert limited_size((10000, 2), 1024) == (1024, 1)
+
+    @pytest.mark.parametrize("max_long_side", [None, 0])
+    def test_disabled(self, max_long_side):
+        """Test: None oder 0 deaktiviert die Skalierung."""
+        assert limited_size((3000, 2000), max_long_side) == (3000, 2000)
+
+
+class TestLimitImageSize:
+    """Tests für limit_image_size()."""
+
+    def test_below_cap_returns_same_image(self):
+        """Test: Kleine Bilder werden unverändert zurückgegeben."""
+        image = Image.new("RGB", (500, 200))
+        assert limit_image_size(image, 1024) is image
+
+    def test_large_image_resized(self):
+        """Test: Große Bilder werden unter Erhalt des Seitenverhältnisses verkleinert."""
+        image = Image.new("RGB", (3000, 2000))
+        resized = limit_image_size(image, 1024)
+        assert resized.size == (1024, 682)
+        assert resized.mode == image.mode
+
+    @pytest.mark.parametrize("max_long_side", [None, 0])
+    def test_disabled(self, max_long_side):
+        """Test: None oder 0 deaktiviert die Skalierung."""
+        image = Image.new("RGB", (3000, 2000))
+        assert limit_image_size(image, max_long_side) is image
+
+
+class TestTruncateAtStop:
+    """Tests für truncate_at_stop()."""
+
+    def test_no_stop_string_found(self):
+        """Test: Ohne Treffer bleibt der Text unverändert."""
+        assert truncate_at_stop("Rechnung 42", ["<|im_end|>"]) == "Rechnung 42"
+
+    def test_cut_at_stop_string(self):
+        """Test: Der Text endet vor dem Stop-String."""
+        assert truncate_at_stop("Rechnung<|im_end|>Rest", ["<|im_end|>"]) == "Rechnung"
+
+    def test_earliest_stop_string_wins(self):
+        """Test: Bei mehreren Stop-Strings gilt das früheste Vorkommen."""
+        assert truncate_at_stop("a STOP b END c", ["END", "STOP"]) == "a "
+
+    def test_stop_string_at_start(self):
+        """Test: Stop-String am Anfang ergibt einen leeren Text."""
+        assert truncate_at_stop("ENDtext", ["END"]) == ""
+
+    def test_empty_stop_strings(self):
+        """Test: Eine leere Liste lässt den Text unverändert."""
+        assert truncate_at_stop("Rechnung", []) == "Rechnung"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])